@@ -1,23 +1,37 @@
 #!/usr/bin/env python
 # coding: utf-8
 
+import argparse
 import os
+import sys
 from datetime import datetime
 from typing import Dict, Optional
 
-from paperbot import hosadigantha, kannada_prabha, prajavani, vishwavani
+from paperbot import bandwidth, hosadigantha, kannada_prabha, prajavani, vishwavani
+from paperbot.bandwidth import BudgetExceeded, parse_size
+from paperbot.concurrency import print_limiter_report
+from paperbot.integrity import read_edition_manifest, write_edition_manifest
+from paperbot.listing import write_listing
+from paperbot.preflight import print_report
+from paperbot.publish import LocalEditionStore, publish_edition
+from paperbot.search import SEARCH_DB, index_edition, prune_index
 from paperbot.utils import (
     cleanup_old_files,
     cleanup_temp_dir,
     ensure_dirs_exist,
     get_date_string,
     get_india_time,
+    list_pages,
     merge_pdfs,
 )
 
 
 def process_paper(
-    name: str, date_string: str, download_func: callable, **kwargs
+    name: str,
+    date_string: str,
+    download_func: callable,
+    store: Optional[LocalEditionStore] = None,
+    **kwargs,
 ) -> Optional[str]:
     """Process (download and merge) a single paper.
 
@@ -25,6 +39,7 @@ def process_paper(
         name: Paper name (used in output filename)
         date_string: Date in YYYYMMDD format
         download_func: Function to call to download paper
+        store: Artifact store to publish the edition to, if any
         **kwargs: Additional arguments for download_func
 
     Returns:
@@ -45,32 +60,104 @@ def process_paper(
 
         output_path = os.path.join("output", f"{name}_{date_string}.pdf")
         if merge_pdfs("tmp", output_path):
+            manifest_path = write_edition_manifest(list_pages("tmp"), output_path)
+            print("Manifest saved:", manifest_path)
+            if store:
+                publish_edition(store, output_path)
             return output_path
 
+    except BudgetExceeded as e:
+        # Pages downloaded so far are an incomplete edition, don't merge them
+        print(f"Stopped {name}: {e}")
+
     except Exception as e:
         print(f"Error processing {name}: {e}")
 
     finally:
+        bandwidth.release_reservation()
         cleanup_temp_dir()
 
     return None
 
 
 def check_existing(date_string: str, paper_id: str) -> bool:
-    """Check if paper already exists for date."""
-    if not os.path.exists("output"):
-        return False
-
-    for file in os.listdir("output"):
-        if file.startswith(paper_id) and date_string in file:
-            print(f"Paper {paper_id} for date {date_string} already exists")
-            return True
+    """Check if paper already exists for date, merged or published."""
+    for d in ("output", "manifests"):
+        if not os.path.exists(d):
+            continue
+
+        for file in os.listdir(d):
+            if file.startswith(paper_id) and date_string in file:
+                print(f"Paper {paper_id} for date {date_string} already exists")
+                return True
     return False
 
 
-def process_all_papers() -> Dict[str, Optional[str]]:
+# Papers processed on every run, lowest "priority" first so the most wanted
+# papers get the bandwidth and byte budget first. "date_format" is the date
+# format the paper's download_paper expects, "kwargs" are passed on to it.
+# "title" and "region" are shown in the listing of available editions.
+# Papers with "enabled": False are skipped on runs but still covered by the
+# offline regression checks (regression.py).
+PAPERS = [
+    {
+        "paper_id": "KANPRABHA_MN",
+        "title": "Kannada Prabha",
+        "region": "Mangaluru",
+        "priority": 1,
+        "module": kannada_prabha,
+        "date_format": "%Y%m%d",
+        "kwargs": {"issue_id": "KANPRABHA_MN"},
+    },
+    {
+        "paper_id": "VISHWAVANI_2",
+        "title": "Vishwavani",
+        "region": "Sub-edition 2",
+        "priority": 2,
+        "module": vishwavani,
+        "date_format": "%Y%m%d",
+        "kwargs": {"sub_edition": 2},  # Add more editions if needed
+    },
+    {
+        "paper_id": "HOSADIGANTHA_MN",
+        "enabled": False,
+        "title": "Hosa Digantha",
+        "region": "Mangaluru",
+        "priority": 3,
+        "module": hosadigantha,
+        "date_format": "%d-%b-%Y",
+        "kwargs": {"edition": "2"},  # edition 2 for Mangaluru
+    },
+    {
+        "paper_id": "PRAJAVANI_BLR",
+        "enabled": False,
+        "title": "Prajavani",
+        "region": "Bengaluru",
+        "priority": 4,
+        "module": prajavani,
+        "date_format": "%Y%m%d",
+        "kwargs": {"edition": "4"},  # edition 4 for Bengaluru
+    },
+]
+
+
+def get_enabled_papers() -> list:
+    """Get papers to process on runs, in order of priority."""
+    papers = [paper for paper in PAPERS if paper.get("enabled", True)]
+    return sorted(papers, key=lambda p: p["priority"])
+
+
+def get_paper_date(paper: Dict, date_string: str) -> str:
+    """Convert YYYYMMDD date to the format expected by paper's scraper."""
+    return datetime.strptime(date_string, "%Y%m%d").strftime(paper["date_format"])
+
+
+def process_all_papers(store: Optional[LocalEditionStore] = None) -> Dict[str, Optional[str]]:
     """Process all configured papers for today's date.
 
+    Args:
+        store: Artifact store to publish editions to, if any
+
     Returns:
         Dict mapping paper names to output paths (or None if failed)
     """
@@ -80,50 +167,98 @@ def process_all_papers() -> Dict[str, Optional[str]]:
     date_string = get_date_string(current_time)
     results = {}
 
-    # Kannada Prabha
-    paper_id = "KANPRABHA_MN"
-    if not check_existing(date_string, paper_id):
-        results[paper_id] = process_paper(
-            paper_id, date_string, kannada_prabha.download_paper, issue_id=paper_id
-        )
-
-    # Vishwavani (both editions if needed)
-    for edition in [2]:  # Add more editions if needed
-        paper_id = f"VISHWAVANI_{edition}"
+    for paper in get_enabled_papers():
+        paper_id = paper["paper_id"]
         if not check_existing(date_string, paper_id):
             results[paper_id] = process_paper(
-                paper_id, date_string, vishwavani.download_paper, sub_edition=edition
+                paper_id,
+                get_paper_date(paper, date_string),
+                paper["module"].download_paper,
+                store=store,
+                **paper["kwargs"],
+            )
+
+    return results
+
+
+def preflight_all_papers() -> Dict[str, list]:
+    """Check availability and size of all configured papers for today's date.
+
+    Nothing is downloaded, only page URLs are checked.
+
+    Returns:
+        Dict mapping paper names to page check results
+    """
+    date_string = get_date_string()
+    results = {}
+
+    for paper in get_enabled_papers():
+        paper_id = paper["paper_id"]
+        try:
+            checks = paper["module"].preflight_paper(
+                get_paper_date(paper, date_string), **paper["kwargs"]
             )
+        except Exception as e:
+            print(f"Error checking {paper_id}: {e}")
+            checks = []
 
-    # # Hosa Digantha
-    # paper_id = "HOSADIGANTHA_MN"
-    # if not check_existing(date_string, paper_id):
-    #     # Convert YYYYMMDD to DD-MMM-YYYY format for Hosa Digantha
-    #     hd_date = datetime.strptime(date_string, "%Y%m%d").strftime("%d-%b-%Y")
-    #     results[paper_id] = process_paper(
-    #         paper_id,
-    #         hd_date,
-    #         hosadigantha.download_paper,
-    #         edition="2",  # edition 2 for Mangaluru
-    #     )
-
-    # # Prajavani
-    # paper_id = "PRAJAVANI_BLR"
-    # if not check_existing(date_string, paper_id):
-    #     results[paper_id] = process_paper(
-    #         paper_id,
-    #         date_string,
-    #         prajavani.download_paper,
-    #         edition="4",  # edition 2 for Mangaluru
-    #     )
+        print_report(f"{paper_id} {date_string}", checks)
+        results[paper_id] = checks
 
     return results
 
 
+def index_papers(results: Dict[str, Optional[str]], db_path: str = SEARCH_DB) -> None:
+    """Add text of successfully merged papers to the search index."""
+    for paper, path in results.items():
+        if not path:
+            continue
+
+        try:
+            manifest = read_edition_manifest(path) or {}
+            index_edition(path, manifest.get("checksum"), db_path)
+        except Exception as e:
+            print(f"Error indexing {paper}: {e}")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Download and merge e-papers")
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="only check which pages are available, don't download anything",
+    )
+    parser.add_argument(
+        "--max-rate",
+        type=parse_size,
+        help="limit total download speed in bytes/sec, e.g. 500K or 2M",
+    )
+    parser.add_argument(
+        "--budget",
+        type=parse_size,
+        help="limit total bytes downloaded in this run, e.g. 300M or 1G",
+    )
+    parser.add_argument(
+        "--publish-dir",
+        help="publish editions and search index to this artifact store directory "
+        "instead of keeping them in the repo",
+    )
+    return parser.parse_args()
+
+
 if __name__ == "__main__":
+    args = parse_args()
+    bandwidth.configure(rate=args.max_rate, budget=args.budget)
+
+    if args.dry_run:
+        preflight_all_papers()
+        print_limiter_report()
+        sys.exit(0)
+
     ensure_dirs_exist("tmp", "output")
 
-    results = process_all_papers()
+    store = LocalEditionStore(args.publish_dir) if args.publish_dir else None
+    results = process_all_papers(store)
 
     # Report results
     print("\nProcessing complete:")
@@ -132,7 +267,19 @@ if __name__ == "__main__":
             print(f"✓ {paper}: {path}")
         else:
             print(f"✗ {paper}: Failed to process")
+    print_limiter_report()
+    if bandwidth.bytes_used() is not None:
+        print(f"Used {bandwidth.bytes_used()}/{args.budget} bytes of the budget")
+
+    db_path = os.path.join(store.root, SEARCH_DB) if store else SEARCH_DB
+    index_papers(results, db_path)
 
     # Cleanup old files
     cleanup_old_files(days=3)
+    cleanup_old_files("manifests", days=3)
     cleanup_temp_dir()
+    if store:
+        store.prune(days=3)
+    prune_index(days=3, db_path=db_path)
+
+    write_listing({paper["paper_id"]: paper for paper in PAPERS})
@@ -0,0 +1,198 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+import requests
+
+CHUNK_SIZE = 1024 * 64
+
+UNITS = {"K": 1000, "M": 1000 ** 2, "G": 1000 ** 3}
+
+
+class BudgetExceeded(Exception):
+    """Raised when a download would go over the run's byte budget."""
+
+
+class TokenBucket:
+    """Token bucket limiting the number of bytes per second.
+
+    Tokens are taken before sleeping, so concurrent downloads queue up
+    behind each other instead of all waking at once.
+    """
+
+    def __init__(self, rate: int, capacity: Optional[int] = None):
+        self.rate = rate
+        self.capacity = capacity or max(rate, CHUNK_SIZE)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def consume(self, n: int) -> float:
+        """Take n tokens, sleeping until they are available.
+
+        Returns:
+            float: Seconds slept
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= n
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0
+
+        if wait:
+            time.sleep(wait)
+        return wait
+
+
+class ByteBudget:
+    """Total number of bytes all downloads of a run may use.
+
+    An edition reserves its expected size before downloading, downloaded
+    bytes are taken from the reservation first.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.used = 0
+        self.reserved = 0
+        self._lock = threading.Lock()
+
+    def reserve(self, n: int) -> bool:
+        """Reserve n bytes, False if they don't fit in the remaining budget."""
+        with self._lock:
+            if self.used + self.reserved + n > self.limit:
+                return False
+            self.reserved += n
+            return True
+
+    def release(self) -> None:
+        """Give back what is left of the reservation."""
+        with self._lock:
+            self.reserved = 0
+
+    def check(self) -> None:
+        """Raise BudgetExceeded if the budget is already used up."""
+        with self._lock:
+            if self.used >= self.limit:
+                raise BudgetExceeded(f"Byte budget of {self.limit} bytes used up")
+
+    def charge(self, n: int) -> None:
+        """Count n downloaded bytes, raise BudgetExceeded if over the limit."""
+        with self._lock:
+            self.used += n
+            self.reserved = max(0, self.reserved - n)
+            if self.used > self.limit:
+                raise BudgetExceeded(f"Byte budget of {self.limit} bytes used up")
+
+
+_bucket: Optional[TokenBucket] = None
+_budget: Optional[ByteBudget] = None
+
+
+def parse_size(value: str) -> int:
+    """Parse sizes like '500K', '2M' or '1G' into bytes."""
+    value = value.strip().upper().rstrip("B")
+    if value and value[-1] in UNITS:
+        return int(float(value[:-1]) * UNITS[value[-1]])
+    return int(value)
+
+
+def configure(rate: Optional[int] = None, budget: Optional[int] = None) -> None:
+    """Set the global bandwidth limit (bytes/sec) and run byte budget.
+
+    None disables the respective limit.
+    """
+    global _bucket, _budget
+    _bucket = TokenBucket(rate) if rate else None
+    _budget = ByteBudget(budget) if budget else None
+
+
+def reserve(size: int) -> bool:
+    """Reserve size bytes of the byte budget for an edition.
+
+    Returns:
+        bool: False if they don't fit in the remaining budget
+    """
+    return _budget is None or _budget.reserve(size)
+
+
+def release_reservation() -> None:
+    """Give back the unused part of the edition's reservation."""
+    if _budget is not None:
+        _budget.release()
+
+
+def check_budget() -> None:
+    """Raise BudgetExceeded before starting a download the budget can't pay for."""
+    if _budget is not None:
+        _budget.check()
+
+
+def throttle(n: int) -> float:
+    """Account for n downloaded bytes against rate limit and budget.
+
+    Returns:
+        float: Seconds slept to stay within the rate limit
+    """
+    if _budget is not None:
+        _budget.charge(n)
+    if _bucket is not None:
+        return _bucket.consume(n)
+    return 0.0
+
+
+def bytes_used() -> Optional[int]:
+    """Bytes charged to the budget so far, None if there is no budget."""
+    return _budget.used if _budget is not None else None
+
+
+def stream_to_file(
+    response: requests.Response,
+    filepath: str,
+    validator=None,
+    transfer: Optional[Dict] = None,
+) -> int:
+    """Write response body to filepath in chunks within bandwidth limits.
+
+    The response should be requested with stream=True. A partially
+    written or invalid file is removed if the download fails.
+
+    Args:
+        response: Streamed response
+        filepath: Where to save the body
+        validator: Optional integrity.StreamValidator fed with every chunk
+        transfer: Optional transfer dict of concurrency.streamed, gets the
+            bytes written and the seconds spent throttled
+
+    Returns:
+        int: Number of bytes written
+    """
+    written = 0
+    try:
+        with open(filepath, "wb") as f:
+            for chunk in response.iter_content(CHUNK_SIZE):
+                if chunk:
+                    throttled = throttle(len(chunk))
+                    if transfer is not None:
+                        transfer["bytes"] += len(chunk)
+                        transfer["throttled"] += throttled
+                    if validator is not None:
+                        validator.update(chunk)
+                    f.write(chunk)
+                    written += len(chunk)
+
+        if validator is not None:
+            validator.finish()
+    except BaseException:
+        if os.path.exists(filepath):
+            os.remove(filepath)
+        raise
+    finally:
+        response.close()
+
+    return written
@@ -0,0 +1,221 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+import requests
+
+# Size of the download thread pools. Actual parallelism per host is decided
+# by that host's AdaptiveLimiter and is never more than this.
+MAX_WORKERS = 16
+
+# Statuses that mean the host wants us to slow down
+BACKOFF_STATUSES = (429, 500, 502, 503, 504)
+
+# Transfer time is compared per MB so pages of different sizes compare.
+# Bodies smaller than this count as this size.
+MIN_TRANSFER_SIZE = 64 * 1024
+
+# Transfer time per MB must be this far above the best before it counts
+# as slow, so normal jitter doesn't halve the limit
+SLOW_MARGIN = 0.2
+
+
+class AdaptiveLimiter:
+    """AIMD limiter for the number of parallel requests to a single host.
+
+    The limit grows by one after each round of healthy requests and is
+    halved on 429/5xx, request errors or when the transfer time per MB
+    climbs to more than twice (and SLOW_MARGIN above) the best seen so far.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        initial: int = 4,
+        minimum: int = 1,
+        maximum: int = MAX_WORKERS,
+        cooldown: float = 1.0,
+    ):
+        self.host = host
+        self.limit = initial
+        self.minimum = minimum
+        self.maximum = maximum
+        self.cooldown = cooldown
+
+        self.in_flight = 0
+        self.healthy_streak = 0
+        self.latency = None  # moving average, seconds per MB
+        self.best_latency = None
+        self.last_backoff = 0.0
+
+        self.requests = 0
+        self.errors = 0
+        self.backoffs = 0
+        self.peak_limit = initial
+
+        self._cond = threading.Condition()
+
+    def acquire(self) -> None:
+        """Wait until a request slot is free and take it."""
+        with self._cond:
+            while self.in_flight >= self.limit:
+                self._cond.wait()
+            self.in_flight += 1
+
+    def release(self, latency: Optional[float], ok: bool) -> None:
+        """Give back a request slot and adjust the limit.
+
+        Args:
+            latency: Transfer time in seconds per MB, None if unknown
+            ok: False if the host failed or asked us to slow down
+        """
+        with self._cond:
+            self.in_flight -= 1
+            self.requests += 1
+
+            slow = False
+            if latency is not None:
+                self.latency = latency if self.latency is None else 0.8 * self.latency + 0.2 * latency
+                if self.best_latency is None or self.latency < self.best_latency:
+                    self.best_latency = self.latency
+                slow = (
+                    self.latency > 2 * self.best_latency
+                    and self.latency - self.best_latency > SLOW_MARGIN
+                )
+
+            if not ok:
+                self.errors += 1
+
+            if not ok or slow:
+                self._backoff()
+            else:
+                self.healthy_streak += 1
+                if self.healthy_streak >= self.limit and self.limit < self.maximum:
+                    self.limit += 1
+                    self.healthy_streak = 0
+                    self.peak_limit = max(self.peak_limit, self.limit)
+
+            self._cond.notify_all()
+
+    def _backoff(self) -> None:
+        """Halve the limit, at most once per cooldown period."""
+        self.healthy_streak = 0
+        now = time.monotonic()
+        if now - self.last_backoff < self.cooldown:
+            return
+
+        self.last_backoff = now
+        self.backoffs += 1
+        self.limit = max(self.minimum, self.limit // 2)
+        # Forget the slow average so the host gets a fresh chance
+        self.latency = self.best_latency
+
+    @contextmanager
+    def slot(self):
+        """Hold a request slot for the duration of the with block."""
+        self.acquire()
+        result = {"latency": None, "ok": False}
+        try:
+            yield result
+        finally:
+            self.release(result["latency"], result["ok"])
+
+    def report(self) -> Dict:
+        """Current state of the limiter for the run report."""
+        with self._cond:
+            return {
+                "host": self.host,
+                "limit": self.limit,
+                "peak_limit": self.peak_limit,
+                "requests": self.requests,
+                "errors": self.errors,
+                "backoffs": self.backoffs,
+                "latency": round(self.latency, 3) if self.latency is not None else None,
+            }
+
+
+_limiters: Dict[str, AdaptiveLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(url: str) -> AdaptiveLimiter:
+    """Get (or create) the limiter for the host of given URL."""
+    host = urlparse(url).netloc
+    with _limiters_lock:
+        if host not in _limiters:
+            _limiters[host] = AdaptiveLimiter(host)
+        return _limiters[host]
+
+
+def request(
+    method: str, url: str, session: Optional[requests.Session] = None, **kwargs
+) -> requests.Response:
+    """Make an HTTP request within the parallelism limit of the URL's host.
+
+    The slot is given back as soon as the response headers arrive, so use
+    it for small requests only and streamed() for page downloads. Takes the
+    same keyword arguments as requests.request.
+    """
+    http = session or requests
+    with get_limiter(url).slot() as result:
+        response = http.request(method, url, **kwargs)
+        result["ok"] = response.status_code not in BACKOFF_STATUSES
+    return response
+
+
+@contextmanager
+def streamed(url: str, session: Optional[requests.Session] = None, **kwargs):
+    """Stream a GET request, holding the host's slot until the body is read.
+
+    Yields (response, transfer). Add the body bytes read to transfer["bytes"]
+    and the seconds spent in bandwidth.throttle to transfer["throttled"],
+    the limiter judges the host by the transfer time per MB without the
+    throttling. Only HTTP and transport errors count against the host. The
+    response is closed when the with block ends.
+    """
+    http = session or requests
+    with get_limiter(url).slot() as result:
+        start = time.monotonic()
+        response = http.request("GET", url, stream=True, **kwargs)
+        result["ok"] = response.status_code not in BACKOFF_STATUSES
+        transfer = {"bytes": 0, "throttled": 0.0}
+        try:
+            yield response, transfer
+        except requests.RequestException:
+            result["ok"] = False
+            raise
+        finally:
+            response.close()
+
+        if transfer["bytes"]:
+            size_mb = max(transfer["bytes"], MIN_TRANSFER_SIZE) / 1000000
+            elapsed = time.monotonic() - start - transfer["throttled"]
+            result["latency"] = max(0.0, elapsed) / size_mb
+
+
+def limiter_report() -> List[Dict]:
+    """Get state of all host limiters used in this run."""
+    with _limiters_lock:
+        limiters = list(_limiters.values())
+    return [limiter.report() for limiter in limiters]
+
+
+def print_limiter_report() -> None:
+    """Print parallelism limits reached for each host."""
+    report = limiter_report()
+    if not report:
+        return
+
+    print("\nHost parallelism:")
+    for r in report:
+        latency = f"{r['latency']}s per MB" if r["latency"] is not None else "latency unknown"
+        print(
+            f"{r['host']}: limit {r['limit']} (peak {r['peak_limit']}), "
+            f"{r['requests']} requests, {r['errors']} errors, "
+            f"{r['backoffs']} backoffs, {latency}"
+        )
@@ -0,0 +1,199 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import hashlib
+import json
+import os
+from typing import Dict, List, Optional
+
+import requests
+
+from paperbot.bandwidth import check_budget, stream_to_file
+from paperbot.concurrency import streamed
+
+# How far from the start/end of a file the magic bytes/trailer may be
+PEEK_SIZE = 1024
+
+# File extension -> (magic bytes at start, trailer bytes at end)
+SIGNATURES = {
+    ".pdf": (b"%PDF-", b"%%EOF"),
+    ".jpg": (b"\xff\xd8\xff", b"\xff\xd9"),
+}
+
+
+class IntegrityError(Exception):
+    """Raised when a downloaded page is truncated or not what it claims to be."""
+
+
+class StreamValidator:
+    """Hash and validate a page while its bytes are written to disk.
+
+    Checks the Content-Length, the PDF/JPEG magic bytes and trailer and
+    computes the SHA-256 without reading the file again.
+    """
+
+    def __init__(self, filepath: str, headers: Optional[Dict] = None):
+        self.filepath = filepath
+        self.kind = os.path.splitext(filepath)[1].lower()
+        self.sha256 = hashlib.sha256()
+        self.size = 0
+        self.head = b""
+        self.tail = b""
+
+        # Content-Length is the encoded size, only usable without encoding
+        headers = headers or {}
+        length = headers.get("Content-Length", "")
+        encoded = headers.get("Content-Encoding", "identity") != "identity"
+        self.expected_size = int(length) if length.isdigit() and not encoded else None
+
+    def update(self, chunk: bytes) -> None:
+        self.sha256.update(chunk)
+        self.size += len(chunk)
+        if len(self.head) < PEEK_SIZE:
+            self.head = (self.head + chunk)[:PEEK_SIZE]
+        self.tail = (self.tail + chunk)[-PEEK_SIZE:]
+
+    def finish(self) -> None:
+        """Raise IntegrityError if the complete download is not valid."""
+        if self.expected_size is not None and self.size != self.expected_size:
+            raise IntegrityError(f"got {self.size} of {self.expected_size} bytes")
+
+        if self.kind not in SIGNATURES:
+            return
+
+        magic, trailer = SIGNATURES[self.kind]
+        if self.kind == ".pdf":
+            valid_start = magic in self.head
+            valid_end = trailer in self.tail
+        else:
+            valid_start = self.head.startswith(magic)
+            valid_end = self.tail.rstrip(b"\x00\r\n ").endswith(trailer)
+
+        if not valid_start:
+            raise IntegrityError(f"not a {self.kind} file: {self.head[:16]!r}")
+        if not valid_end:
+            raise IntegrityError(f"truncated {self.kind} file, trailer missing")
+
+    def hexdigest(self) -> str:
+        return self.sha256.hexdigest()
+
+
+def write_checksum(filepath: str, sha256: str) -> None:
+    """Save page hash next to the page, in sha256sum format."""
+    with open(filepath + ".sha256", "w") as f:
+        f.write(f"{sha256}  {os.path.basename(filepath)}\n")
+
+
+def read_checksum(filepath: str) -> Optional[str]:
+    """Get page hash saved by write_checksum, None if there is none."""
+    try:
+        with open(filepath + ".sha256") as f:
+            return f.read().split()[0]
+    except (OSError, IndexError):
+        return None
+
+
+def download_verified(
+    url: str,
+    filepath: str,
+    session: Optional[requests.Session] = None,
+    retries: int = 2,
+    **kwargs,
+) -> bool:
+    """Download url to filepath, validating and hashing it on the way.
+
+    Invalid downloads are retried right away, up to retries times. The
+    page hash is saved with write_checksum.
+
+    Args:
+        url: Page URL
+        filepath: Where to save the page, extension decides the checks
+        session: Optional session to reuse
+        retries: Number of retries after an invalid download
+        **kwargs: Additional arguments for the GET request
+
+    Returns:
+        bool: True if a valid page was saved
+    """
+    # Fail before connecting, so pages queued after the budget ran out
+    # don't each download a chunk first
+    check_budget()
+
+    for attempt in range(1, retries + 2):
+        try:
+            with streamed(url, session, **kwargs) as (response, transfer):
+                if response.status_code != 200:
+                    print(f"Error downloading {url}: {response.status_code}")
+                    return False
+
+                validator = StreamValidator(filepath, response.headers)
+                stream_to_file(response, filepath, validator, transfer)
+        except IntegrityError as e:
+            print(f"Invalid download {url} (attempt {attempt}): {e}")
+            continue
+
+        write_checksum(filepath, validator.hexdigest())
+        return True
+
+    return False
+
+
+def edition_manifest(page_paths: List[str], output_path: str) -> Dict:
+    """Build manifest of a merged edition from the hashes of its pages.
+
+    The edition checksum is the SHA-256 of the page hashes in page order,
+    so the merged file doesn't have to be read again.
+
+    Args:
+        page_paths: Page files in the order they were merged
+        output_path: Path of the merged edition
+
+    Returns:
+        dict: Manifest with per-page size and hash and the edition checksum
+    """
+    pages = [
+        {
+            "file": os.path.basename(path),
+            "size": os.path.getsize(path),
+            "sha256": read_checksum(path),
+        }
+        for path in page_paths
+    ]
+    page_hashes = "\n".join(page["sha256"] or "" for page in pages)
+
+    return {
+        "file": os.path.basename(output_path),
+        "size": os.path.getsize(output_path),
+        "page_count": len(pages),
+        "checksum": hashlib.sha256(page_hashes.encode()).hexdigest(),
+        "pages": pages,
+    }
+
+
+def write_edition_manifest(
+    page_paths: List[str], output_path: str, manifest_dir: str = "manifests"
+) -> str:
+    """Write edition manifest as JSON named after the edition.
+
+    Returns:
+        str: Path to the manifest file
+    """
+    os.makedirs(manifest_dir, exist_ok=True)
+    manifest = edition_manifest(page_paths, output_path)
+    name = os.path.splitext(manifest["file"])[0]
+    manifest_path = os.path.join(manifest_dir, f"{name}.json")
+
+    with open(manifest_path, "w") as f:
+        json.dump(manifest, f, indent=2)
+
+    return manifest_path
+
+
+def read_edition_manifest(output_path: str, manifest_dir: str = "manifests") -> Optional[Dict]:
+    """Load manifest written by write_edition_manifest, None if missing."""
+    name = os.path.splitext(os.path.basename(output_path))[0]
+    try:
+        with open(os.path.join(manifest_dir, f"{name}.json")) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
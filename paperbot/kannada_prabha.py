@@ -2,12 +2,13 @@
 # coding: utf-8
 
 import os
-from functools import partial
-from multiprocessing.dummy import Pool as ThreadPool
 from typing import Optional
 
 import requests
 
+from paperbot.integrity import download_verified
+from paperbot.preflight import check_urls, download_edition
+
 
 def get_page_count(issue_id: str, date_string: str) -> int:
     """Get total number of pages for given issue and date."""
@@ -25,6 +26,33 @@ def get_page_count(issue_id: str, date_string: str) -> int:
         return 0
 
 
+def get_page_url(issue_id: str, date_string: str, page_no: int) -> str:
+    """Build PDF URL for a single page of given issue and date."""
+    issue = issue_id.split("_")[0]
+    region = issue_id.split("_")[1]
+    yyyy = date_string[:4]
+    mm = date_string[4:6]
+    dd = date_string[6:8]
+    page_no = str(page_no).zfill(2)
+
+    return f"https://www.enewspapr.com/News/{issue}/{region}/{yyyy}/{mm}/{dd}/{date_string}_{page_no}.PDF"
+
+
+def preflight_paper(date_string: str, issue_id: str) -> list:
+    """Check availability and size of all pages without downloading them.
+
+    Args:
+        date_string: Date in YYYYMMDD format
+        issue_id: Paper issue ID (e.g., 'KANPRABHA_MN')
+
+    Returns:
+        list: Page check results (see preflight.check_url), in page order
+    """
+    page_count = get_page_count(issue_id, date_string)
+    page_urls = [get_page_url(issue_id, date_string, p) for p in range(1, page_count + 1)]
+    return check_urls(page_urls)
+
+
 def download_page(issue_id: str, date_string: str, page_no: int) -> Optional[str]:
     """Download a single page PDF.
     
@@ -36,28 +64,17 @@ def download_page(issue_id: str, date_string: str, page_no: int) -> Optional[str
     Returns:
         str: Path to downloaded file, or None if download failed
     """
-    issue = issue_id.split("_")[0]
-    region = issue_id.split("_")[1]
-    yyyy = date_string[:4]
-    mm = date_string[4:6]
-    dd = date_string[6:8]
-    page_no = str(page_no).zfill(2)
-
-    page_url = f"https://www.enewspapr.com/News/{issue}/{region}/{yyyy}/{mm}/{dd}/{date_string}_{page_no}.PDF"
+    page_url = get_page_url(issue_id, date_string, page_no)
     
-    try:
-        response = requests.get(page_url)
-        print(f"Downloading {page_url}: {response.status_code}")
+    filename = page_url.rsplit("/", 1)[-1]
+    filepath = os.path.join("tmp", filename)
 
-        if response.status_code == 200:
-            filename = page_url.rsplit("/", 1)[-1]
-            filepath = os.path.join("tmp", filename)
-            
-            with open(filepath, "wb") as f:
-                f.write(response.content)
+    try:
+        print(f"Downloading {page_url}")
+        if download_verified(page_url, filepath):
             return filepath
             
-    except Exception as e:
+    except (requests.RequestException, OSError) as e:
         print(f"Error downloading page {page_no}: {e}")
     
     return None
@@ -71,30 +88,11 @@ def download_paper(date_string: str, issue_id: str) -> bool:
         issue_id: Paper issue ID (e.g., 'KANPRABHA_MN')
     
     Returns:
-        bool: True if any pages were downloaded successfully
+        bool: True if every page was downloaded and validated
     """
-    page_count = get_page_count(issue_id, date_string)
-    if not page_count:
-        print("No pages found to download")
-        return False
-
-    print(f"Downloading {page_count} pages for {issue_id} {date_string}")
-    
-    pages = list(range(1, page_count + 1))
-    
-    # Download pages in parallel
-    pool = ThreadPool(8)
-    func = partial(download_page, issue_id, date_string)
-    
-    try:
-        results = pool.map(func, pages)
-    finally:
-        pool.close()
-        pool.join()
-    
-    # Filter out failed downloads
-    downloaded = [r for r in results if r]
-    success = len(downloaded) > 0
-    
-    print(f"Downloaded {len(downloaded)}/{page_count} pages")
-    return success
\ No newline at end of file
+    checks = preflight_paper(date_string, issue_id)
+    return download_edition(
+        f"{issue_id} {date_string}",
+        checks,
+        lambda idx: download_page(issue_id, date_string, idx + 1),
+    )
@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import datetime as dt
+import gzip
+import json
+import os
+from typing import Dict, List
+
+from flask import render_template
+
+from webapp import create_app
+
+LISTING_DIR = os.path.join("webapp", "static", "listing")
+
+# Where merged editions in output/ can be downloaded from
+DOWNLOAD_BASE_URL = "https://raw.githubusercontent.com/sankethsj/newspaper-bot/main/output/"
+SITE_URL = "https://sankethsj.github.io/epaper/"
+
+
+def collect_editions(papers: Dict[str, Dict], manifest_dir: str = "manifests") -> List[Dict]:
+    """Build listing entries from edition manifests, newest first.
+
+    Args:
+        papers: Paper registry entries by paper_id, for title and region
+        manifest_dir: Directory with edition manifests
+
+    Returns:
+        list: Editions with paper, title, region, date, size, page count and url
+    """
+    if not os.path.isdir(manifest_dir):
+        return []
+
+    editions = []
+    for file in os.listdir(manifest_dir):
+        if not file.endswith(".json"):
+            continue
+
+        try:
+            with open(os.path.join(manifest_dir, file)) as f:
+                manifest = json.load(f)
+            paper_id, date_string = os.path.splitext(manifest["file"])[0].rsplit("_", 1)
+            date = dt.datetime.strptime(date_string, "%Y%m%d")
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Skipping manifest '{file}': {e}")
+            continue
+
+        paper = papers.get(paper_id, {})
+        editions.append({
+            "paper": paper_id,
+            "title": paper.get("title", paper_id),
+            "region": paper.get("region", ""),
+            "date": date.strftime("%Y-%m-%d"),
+            "size": manifest["size"],
+            "page_count": manifest["page_count"],
+            "checksum": manifest["checksum"],
+            "url": manifest.get("url") or DOWNLOAD_BASE_URL + manifest["file"],
+        })
+
+    return sorted(editions, key=lambda e: (e["date"], e["paper"]), reverse=True)
+
+
+def render_template_file(template: str, editions: List[Dict], **context) -> str:
+    """Render a webapp template at build time, outside of a request.
+
+    Uses the webapp's own templates so the static listing looks the same as
+    the pages served by the webapp.
+    """
+    editions = [
+        dict(
+            e,
+            display_date=dt.datetime.strptime(e["date"], "%Y-%m-%d").strftime("%d-%m-%Y"),
+            size_mb=round(e["size"] / 1000000, 2),
+        )
+        for e in editions
+    ]
+
+    app = create_app()
+    # url_for in the templates needs a request context
+    with app.test_request_context("/"):
+        return render_template(template, editions=editions, **context)
+
+
+def render_html(editions: List[Dict]) -> str:
+    return render_template_file("listing.html", editions)
+
+
+def render_feed(editions: List[Dict]) -> str:
+    updated = editions[0]["date"] if editions else "1970-01-01"
+    return render_template_file(
+        "feed.xml", editions, site_url=SITE_URL, updated=f"{updated}T00:00:00+05:30"
+    )
+
+
+def write_precompressed(path: str, content: str) -> None:
+    """Write content to path and a gzipped copy to path.gz."""
+    data = content.encode("utf-8")
+    with open(path, "wb") as f:
+        f.write(data)
+
+    # mtime=0 keeps the .gz unchanged when the content is, so git sees no change
+    with open(path + ".gz", "wb") as f:
+        f.write(gzip.compress(data, compresslevel=9, mtime=0))
+
+
+def write_listing(
+    papers: Dict[str, Dict], manifest_dir: str = "manifests", listing_dir: str = LISTING_DIR
+) -> List[Dict]:
+    """Write JSON and HTML listing and Atom feed of all available editions.
+
+    Each file is written with a gzipped copy for the webapp to serve as is.
+
+    Returns:
+        list: Editions in the listing
+    """
+    os.makedirs(listing_dir, exist_ok=True)
+    editions = collect_editions(papers, manifest_dir)
+
+    write_precompressed(
+        os.path.join(listing_dir, "papers.json"), json.dumps(editions, ensure_ascii=False)
+    )
+    write_precompressed(os.path.join(listing_dir, "index.html"), render_html(editions))
+    write_precompressed(os.path.join(listing_dir, "feed.atom"), render_feed(editions))
+
+    print(f"Listing of {len(editions)} editions saved to '{listing_dir}'")
+    return editions
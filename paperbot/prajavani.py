@@ -1,11 +1,13 @@
 #!/usr/bin/env python
 # coding: utf-8
 import os
-from multiprocessing.dummy import Pool as ThreadPool
 from typing import Optional
 
 import requests
 
+from paperbot.integrity import download_verified
+from paperbot.preflight import check_urls, download_edition
+
 # User agent
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
@@ -63,6 +65,20 @@ def get_page_urls(date_string: str, edition: str = "4") -> list:
         return []
 
 
+def preflight_paper(date_string: str, edition: str = "4") -> list:
+    """Check availability and size of all pages without downloading them.
+
+    Args:
+        date_string: Date in YYYYMMDD format (e.g., '20260506')
+        edition: Edition number (default '4' for Bengaluru)
+
+    Returns:
+        list: Page check results (see preflight.check_url), in page order
+    """
+    page_urls = get_page_urls(date_string, edition)
+    return check_urls(page_urls, headers=HEADERS)
+
+
 def download_page(url: str, page_no: int, output_dir: str = "tmp") -> Optional[str]:
     """Download a single page pdf.
 
@@ -78,21 +94,16 @@ def download_page(url: str, page_no: int, output_dir: str = "tmp") -> Optional[s
         # Create output directory if it doesn't exist
         os.makedirs(output_dir, exist_ok=True)
 
-        # Download image
+        # Zero padded so pages sort in page order when merging
         print(f"Downloading {url}")
-        response = requests.get(url, headers=HEADERS)
-        if response.status_code != 200:
-            print(f"Error downloading page {page_no}: {response.status_code}")
+        pdf_path = os.path.join(output_dir, f"page_{page_no:03d}.pdf")
+        if not download_verified(url, pdf_path, headers=HEADERS):
+            print(f"Error downloading page {page_no}")
             return None
 
-        # Save as temporary image file
-        pdf_path = os.path.join(output_dir, f"page_{page_no}.pdf")
-        with open(pdf_path, "wb") as f:
-            f.write(response.content)
-
         return pdf_path
 
-    except Exception as e:
+    except (requests.RequestException, OSError) as e:
         print(f"Error downloading page {page_no}: {e}")
         return None
 
@@ -105,30 +116,12 @@ def download_paper(date_string: str, edition: str = "4") -> bool:
         edition: Edition number (default '4' for Bengaluru)
 
     Returns:
-        bool: True if any pages were downloaded successfully
+        bool: True if every page was downloaded and validated
     """
-    # Get all page URLs
-    page_urls = get_page_urls(date_string, edition)
-    if not page_urls:
-        print("No pages found to download")
-        return False
-
-    print(f"Found {len(page_urls)} pages to download")
-
-    # Download pages in parallel
-    pool = ThreadPool(8)
-
-    try:
-        # Create list of (url, page_no) tuples for downloading
-        download_tasks = [(url, idx, "tmp") for idx, url in enumerate(page_urls, 1)]
-        results = pool.starmap(download_page, download_tasks)
-    finally:
-        pool.close()
-        pool.join()
-
-    # Filter out failed downloads
-    downloaded = [r for r in results if r]
-    success = len(downloaded) > 0
-
-    print(f"Downloaded {len(downloaded)}/{len(page_urls)} pages")
-    return success
+    # Get all page URLs and check them before downloading
+    checks = preflight_paper(date_string, edition)
+    return download_edition(
+        f"edition {edition} for {date_string}",
+        checks,
+        lambda idx: download_page(checks[idx]["url"], idx + 1),
+    )
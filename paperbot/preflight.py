@@ -0,0 +1,201 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+from multiprocessing.dummy import Pool as ThreadPool
+from typing import Callable, Dict, List, Optional
+
+import requests
+
+from paperbot.bandwidth import reserve
+from paperbot.concurrency import MAX_WORKERS, request
+
+# Statuses that mean the page is definitely not there (yet)
+MISSING_STATUSES = (404, 410)
+
+
+def _parse_size(response: requests.Response) -> Optional[int]:
+    """Get full resource size from Content-Range or Content-Length headers."""
+    content_range = response.headers.get("Content-Range", "")
+    if "/" in content_range:
+        total = content_range.rsplit("/", 1)[-1]
+        if total.isdigit():
+            return int(total)
+
+    if response.status_code == 200 and response.request.method == "HEAD":
+        length = response.headers.get("Content-Length", "")
+        if length.isdigit():
+            return int(length)
+
+    return None
+
+
+def check_url(
+    url: str,
+    session: Optional[requests.Session] = None,
+    headers: Optional[Dict] = None,
+    timeout: int = 15,
+) -> Dict:
+    """Check a single page URL without downloading its body.
+
+    Tries a HEAD request first and falls back to a 1-byte Range GET for
+    servers that don't answer HEAD properly.
+
+    Args:
+        url: Page URL to check
+        session: Optional session to reuse (cookies, CSRF etc.)
+        headers: Optional request headers
+        timeout: Request timeout in seconds
+
+    Returns:
+        dict: {"url", "status", "available", "size"} where available is
+            True/False, or None if the server gave no clear answer
+    """
+    result = {"url": url, "status": None, "available": None, "size": None}
+
+    try:
+        response = request(
+            "HEAD", url, session, headers=headers, allow_redirects=True, timeout=timeout
+        )
+        size = _parse_size(response)
+
+        if response.status_code != 200 or size is None:
+            range_headers = dict(headers or {}, Range="bytes=0-0")
+            response = request(
+                "GET",
+                url,
+                session,
+                headers=range_headers,
+                stream=True,
+                allow_redirects=True,
+                timeout=timeout,
+            )
+            size = _parse_size(response)
+            if size is None and response.status_code == 200:
+                length = response.headers.get("Content-Length", "")
+                size = int(length) if length.isdigit() else None
+            response.close()
+
+        result["status"] = response.status_code
+        result["size"] = size
+        if response.status_code in (200, 206):
+            result["available"] = True
+        elif response.status_code in MISSING_STATUSES:
+            result["available"] = False
+
+    except Exception as e:
+        print(f"Error checking {url}: {e}")
+
+    return result
+
+
+def check_urls(
+    urls: List[str],
+    session: Optional[requests.Session] = None,
+    headers: Optional[Dict] = None,
+) -> List[Dict]:
+    """Check all page URLs in parallel. Results keep the order of urls."""
+    pool = ThreadPool(MAX_WORKERS)
+    try:
+        results = pool.map(lambda url: check_url(url, session, headers), urls)
+    finally:
+        pool.close()
+        pool.join()
+
+    return results
+
+
+def is_complete(checks: List[Dict]) -> bool:
+    """True unless some page is known to be missing."""
+    return bool(checks) and all(c["available"] is not False for c in checks)
+
+
+def largest_first(checks: List[Dict]) -> List[int]:
+    """Get indexes into checks ordered by expected size, largest first.
+
+    Pages of unknown size keep their original order after the known ones.
+    """
+    return sorted(
+        range(len(checks)),
+        key=lambda i: (checks[i]["size"] is None, -(checks[i]["size"] or 0), i),
+    )
+
+
+def total_size(checks: List[Dict]) -> int:
+    """Sum of expected sizes of all pages with a known size."""
+    return sum(c["size"] or 0 for c in checks)
+
+
+def expected_size(checks: List[Dict]) -> int:
+    """Expected edition size, pages of unknown size count as the average page."""
+    known = [c["size"] for c in checks if c["size"] is not None]
+    if not known:
+        return 0
+    return total_size(checks) + (len(checks) - len(known)) * sum(known) // len(known)
+
+
+def ready_to_download(name: str, checks: List[Dict]) -> bool:
+    """Check that an edition is complete and reserve its size in the byte budget.
+
+    Call bandwidth.release_reservation() when the edition is done.
+    """
+    if not is_complete(checks):
+        print(f"Skipping incomplete edition {name}")
+        return False
+
+    if not reserve(expected_size(checks)):
+        print(f"Skipping {name}: {expected_size(checks)} bytes won't fit in the byte budget")
+        return False
+
+    return True
+
+
+def download_edition(
+    name: str, checks: List[Dict], download_page: Callable[[int], Optional[str]]
+) -> bool:
+    """Download all pages of a checked edition in parallel, largest first.
+
+    Args:
+        name: Edition name for messages
+        checks: Page check results in page order
+        download_page: Downloads the page at given index into checks,
+            returns its path or None if it failed
+
+    Returns:
+        bool: True if every page was downloaded and validated. A partial
+            edition must not be merged or published.
+    """
+    if not checks:
+        print("No pages found to download")
+        return False
+
+    if not ready_to_download(name, checks):
+        return False
+
+    print(f"Downloading {len(checks)} pages of {name}")
+
+    # BudgetExceeded from a page stops the whole edition, see bot.process_paper
+    pool = ThreadPool(MAX_WORKERS)
+    try:
+        results = pool.map(download_page, largest_first(checks))
+    finally:
+        pool.close()
+        pool.join()
+
+    downloaded = [r for r in results if r]
+    print(f"Downloaded {len(downloaded)}/{len(checks)} pages")
+    return len(downloaded) == len(checks)
+
+
+def print_report(name: str, checks: List[Dict]) -> None:
+    """Print availability and expected sizes for a paper."""
+    available = sum(1 for c in checks if c["available"])
+    missing = [c["url"] for c in checks if c["available"] is False]
+    unknown = sum(1 for c in checks if c["available"] is None)
+
+    print(f"\nPreflight {name}: {available}/{len(checks)} pages available")
+    print(f"Expected size: {round(expected_size(checks) / 1000000, 2)} MB")
+    if unknown:
+        print(f"Could not verify {unknown} pages")
+    for url in missing:
+        print(f"Missing: {url}")
+    print("Edition complete" if is_complete(checks) else "Edition incomplete")
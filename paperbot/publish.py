@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import datetime as dt
+import json
+import os
+import shutil
+from typing import Dict
+
+from paperbot.integrity import read_edition_manifest
+from paperbot.utils import get_india_time
+
+# Where the artifact store is published, the workflow force-pushes it to
+# the "editions" branch
+STORE_BASE_URL = "https://raw.githubusercontent.com/sankethsj/newspaper-bot/editions/"
+
+
+class LocalEditionStore:
+    """Directory backed store for published editions.
+
+    Layout:
+        editions/   merged editions
+        manifests/  edition manifests, same as in the main repo
+
+    Pages are not stored separately, the merged edition already holds them.
+    An edition whose pages changed is copied again as a whole.
+    """
+
+    def __init__(self, root: str, base_url: str = STORE_BASE_URL):
+        self.root = root
+        self.base_url = base_url
+        for d in ("editions", "manifests"):
+            os.makedirs(os.path.join(root, d), exist_ok=True)
+
+    def manifest_path(self, filename: str) -> str:
+        return os.path.join(self.root, "manifests", f"{os.path.splitext(filename)[0]}.json")
+
+    def put_edition(self, path: str, checksum: str) -> bool:
+        """Store a merged edition. Returns False if it is already stored with these pages.
+
+        Args:
+            path: Path of the merged edition
+            checksum: Edition checksum from its manifest
+        """
+        filename = os.path.basename(path)
+        edition_path = os.path.join(self.root, "editions", filename)
+        try:
+            with open(self.manifest_path(filename)) as f:
+                stored_checksum = json.load(f).get("checksum")
+        except (OSError, ValueError):
+            stored_checksum = None
+
+        if os.path.exists(edition_path) and stored_checksum == checksum:
+            return False
+
+        shutil.copyfile(path, edition_path)
+        return True
+
+    def edition_url(self, filename: str) -> str:
+        return f"{self.base_url}editions/{filename}"
+
+    def prune(self, days: int) -> None:
+        """Delete editions older than days."""
+        current_time = get_india_time().replace(tzinfo=None)
+        manifest_dir = os.path.join(self.root, "manifests")
+
+        for file in os.listdir(manifest_dir):
+            manifest_path = os.path.join(manifest_dir, file)
+            try:
+                with open(manifest_path) as f:
+                    manifest = json.load(f)
+                date_string = os.path.splitext(manifest["file"])[0].split("_")[-1]
+                file_date = dt.datetime.strptime(date_string, "%Y%m%d")
+            except (OSError, ValueError, KeyError) as e:
+                print(f"Skipping manifest '{file}': {e}")
+                continue
+
+            if (current_time - file_date).days > days:
+                print(f"Deleting edition '{manifest['file']}' older than {days} days")
+                os.remove(manifest_path)
+                edition_path = os.path.join(self.root, "editions", manifest["file"])
+                if os.path.exists(edition_path):
+                    os.remove(edition_path)
+
+
+def publish_edition(
+    store: LocalEditionStore, output_path: str, manifest_dir: str = "manifests"
+) -> Dict:
+    """Upload a merged edition to the store and update its manifest.
+
+    The edition is only copied if the store doesn't already have it with
+    the same manifest checksum. The manifest in manifest_dir gets the
+    edition's download URL and is copied to the store.
+
+    Args:
+        store: Store to publish to
+        output_path: Path of the merged edition
+        manifest_dir: Directory with edition manifests in the main repo
+
+    Returns:
+        dict: Updated edition manifest
+    """
+    manifest = read_edition_manifest(output_path, manifest_dir)
+    uploaded = store.put_edition(output_path, manifest["checksum"])
+    manifest["url"] = store.edition_url(manifest["file"])
+
+    name = os.path.splitext(manifest["file"])[0]
+    for d in (manifest_dir, os.path.join(store.root, "manifests")):
+        with open(os.path.join(d, f"{name}.json"), "w") as f:
+            json.dump(manifest, f, indent=2)
+
+    print(f"Published {manifest['file']}" if uploaded else f"{manifest['file']} already published")
+    return manifest
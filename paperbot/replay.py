@@ -0,0 +1,192 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import datetime as dt
+import json
+import os
+import shutil
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import add_dict_to_cookiejar, cookiejar_from_dict
+
+# Request headers that change which response the server sends
+KEY_HEADERS = ("Range",)
+
+_original_request = requests.Session.request
+
+
+class ReplayError(requests.ConnectionError):
+    """Raised in replay mode for requests that were never recorded."""
+
+
+def _request_key(method: str, url: str, kwargs: Dict) -> Tuple:
+    """Identify a request by method, URL, form data and relevant headers."""
+    data = kwargs.get("data") or {}
+    data = sorted(data.items()) if isinstance(data, dict) else data
+    params = kwargs.get("params") or {}
+    params = sorted(params.items()) if isinstance(params, dict) else params
+    headers = CaseInsensitiveDict(kwargs.get("headers") or {})
+    key_headers = [(h, headers[h]) for h in KEY_HEADERS if h in headers]
+    return (method.upper(), url, json.dumps(data), json.dumps(params), json.dumps(key_headers))
+
+
+class Recorder:
+    """Save every HTTP response made through requests to fixture_dir.
+
+    Responses are stored in responses.json with bodies in separate files,
+    so they can be served again by Player.
+    """
+
+    def __init__(self, fixture_dir: str):
+        self.fixture_dir = fixture_dir
+        self.entries: List[Dict] = []
+        self._lock = threading.Lock()
+        os.makedirs(fixture_dir, exist_ok=True)
+
+    def request(self, session: requests.Session, method: str, url: str, **kwargs) -> requests.Response:
+        response = _original_request(session, method, url, **kwargs)
+        body = response.content  # reads streamed bodies too, iter_content reuses it
+
+        headers = dict(response.headers)
+        # requests already decoded the body, store it as sent without encoding
+        if headers.pop("Content-Encoding", None) and "Content-Length" in headers:
+            headers["Content-Length"] = str(len(body))
+
+        with self._lock:
+            body_file = f"{len(self.entries):04d}.bin"
+            self.entries.append({
+                "key": list(_request_key(method, url, kwargs)),
+                "url": response.url,
+                "status": response.status_code,
+                "headers": headers,
+                "cookies": response.cookies.get_dict(),
+                "elapsed": response.elapsed.total_seconds(),
+                "body": body_file,
+            })
+
+        with open(os.path.join(self.fixture_dir, body_file), "wb") as f:
+            f.write(body)
+
+        return response
+
+    def save(self) -> None:
+        with open(os.path.join(self.fixture_dir, "responses.json"), "w") as f:
+            json.dump(self.entries, f, indent=2)
+
+
+class FixtureWriter:
+    """Write made up responses in the format Recorder saves, for Player.
+
+    Used for synthetic fixtures that don't need the live sites.
+    """
+
+    def __init__(self, fixture_dir: str):
+        self.fixture_dir = fixture_dir
+        self.entries: List[Dict] = []
+        shutil.rmtree(fixture_dir, ignore_errors=True)
+        os.makedirs(fixture_dir)
+
+    def add(
+        self,
+        method: str,
+        url: str,
+        body: bytes = b"",
+        headers: Optional[Dict] = None,
+        cookies: Optional[Dict] = None,
+        **kwargs,
+    ) -> None:
+        """Add a 200 response to the request made with method, url and kwargs."""
+        body_file = f"{len(self.entries):04d}.bin"
+        with open(os.path.join(self.fixture_dir, body_file), "wb") as f:
+            f.write(body)
+
+        self.entries.append({
+            "key": list(_request_key(method, url, kwargs)),
+            "url": url,
+            "status": 200,
+            "headers": headers or {},
+            "cookies": cookies or {},
+            "elapsed": 0.05,
+            "body": body_file,
+        })
+
+    def add_page(self, url: str, body: bytes, **kwargs) -> None:
+        """Add preflight HEAD and download GET responses of a page."""
+        headers = {"Content-Length": str(len(body))}
+        self.add("HEAD", url, headers=headers, **kwargs)
+        self.add("GET", url, body, headers=headers, **kwargs)
+
+    def save(self) -> None:
+        with open(os.path.join(self.fixture_dir, "responses.json"), "w") as f:
+            json.dump(self.entries, f, indent=2)
+
+
+class Player:
+    """Serve responses saved by Recorder instead of going to the network."""
+
+    def __init__(self, fixture_dir: str):
+        self.fixture_dir = fixture_dir
+        self.unmatched: List[str] = []
+
+        with open(os.path.join(fixture_dir, "responses.json")) as f:
+            entries = json.load(f)
+        # Later recordings of the same request win, like on the live site
+        self.entries = {tuple(entry["key"]): entry for entry in entries}
+
+    def request(self, session: requests.Session, method: str, url: str, **kwargs) -> requests.Response:
+        entry = self.entries.get(_request_key(method, url, kwargs))
+        if entry is None:
+            self.unmatched.append(f"{method} {url}")
+            raise ReplayError(f"No recorded response for {method} {url}")
+
+        with open(os.path.join(self.fixture_dir, entry["body"]), "rb") as f:
+            body = f.read()
+
+        response = requests.Response()
+        response.status_code = entry["status"]
+        response.headers = CaseInsensitiveDict(entry["headers"])
+        response.url = entry["url"]
+        response.elapsed = dt.timedelta(seconds=entry["elapsed"])
+        response.request = requests.Request(method, url).prepare()
+        response.cookies = cookiejar_from_dict(entry["cookies"])
+        response._content = body
+        response._content_consumed = True
+        add_dict_to_cookiejar(session.cookies, entry["cookies"])
+        return response
+
+
+@contextmanager
+def patched(handler):
+    """Route all requests made through requests to handler.request."""
+    def request(session, method, url, **kwargs):
+        return handler.request(session, method, url, **kwargs)
+
+    requests.Session.request = request
+    try:
+        yield handler
+    finally:
+        requests.Session.request = _original_request
+
+
+@contextmanager
+def recording(fixture_dir: str):
+    """Record all responses within the with block to fixture_dir."""
+    recorder = Recorder(fixture_dir)
+    try:
+        with patched(recorder):
+            yield recorder
+    finally:
+        recorder.save()
+
+
+def replaying(fixture_dir: str):
+    """Serve all requests within the with block from fixture_dir."""
+    return patched(Player(fixture_dir))
+
+
+def has_fixtures(fixture_dir: str) -> bool:
+    return os.path.exists(os.path.join(fixture_dir, "responses.json"))
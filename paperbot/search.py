@@ -0,0 +1,221 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import datetime as dt
+import html
+import os
+import re
+import sqlite3
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+from pypdf import PdfReader
+
+from paperbot.utils import get_india_time
+
+SEARCH_DB = os.path.join("index", "search.db")
+
+# unicode61 treats combining marks as separators, which splits Kannada words
+# at every vowel sign and virama. Declare the Kannada marks as token chars.
+KANNADA_MARKS = "".join(
+    chr(c) for c in range(0x0C80, 0x0D00) if unicodedata.category(chr(c)) in ("Mn", "Mc")
+)
+
+# Zero width (non-)joiners only affect rendering, drop them so they don't
+# break words apart
+ZERO_WIDTH = re.compile("[\u200b\u200c\u200d\ufeff]")
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS editions (
+    name TEXT PRIMARY KEY,
+    paper TEXT NOT NULL,
+    date TEXT NOT NULL,
+    checksum TEXT,
+    page_count INTEGER NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS pages USING fts5(
+    text,
+    name UNINDEXED,
+    page UNINDEXED,
+    tokenize = "unicode61 remove_diacritics 0 tokenchars '{KANNADA_MARKS}'"
+);
+"""
+
+
+def normalize(text: str) -> str:
+    """Normalize text the same way for indexing and querying."""
+    text = unicodedata.normalize("NFC", text)
+    text = ZERO_WIDTH.sub("", text)
+    return " ".join(text.split())
+
+
+def connect(db_path: str = SEARCH_DB) -> sqlite3.Connection:
+    """Open the search index for writing, creating it if needed."""
+    os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+    conn = sqlite3.connect(db_path)
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _extract_range(pdf_path: str, start: int, stop: int) -> List[str]:
+    """Extract text of pages start..stop-1 (runs in a worker process)."""
+    reader = PdfReader(pdf_path)
+    texts = []
+    for page_no in range(start, stop):
+        try:
+            texts.append(normalize(reader.pages[page_no].extract_text() or ""))
+        except Exception as e:
+            print(f"Error extracting text of page {page_no + 1}: {e}")
+            texts.append("")
+    return texts
+
+
+def extract_pages(pdf_path: str, workers: Optional[int] = None) -> List[str]:
+    """Extract text of every page of a PDF on a process pool.
+
+    Args:
+        pdf_path: Path to the PDF
+        workers: Number of worker processes (default: CPU count)
+
+    Returns:
+        list: Normalized text of each page, in page order
+    """
+    page_count = len(PdfReader(pdf_path).pages)
+    if not page_count:
+        return []
+
+    workers = max(1, min(workers or os.cpu_count() or 1, page_count))
+    step = -(-page_count // workers)  # ceil division
+    ranges = [(start, min(start + step, page_count)) for start in range(0, page_count, step)]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_extract_range, pdf_path, *r) for r in ranges]
+        return [text for future in futures for text in future.result()]
+
+
+def index_edition(
+    pdf_path: str, checksum: Optional[str] = None, db_path: str = SEARCH_DB
+) -> int:
+    """Add a merged edition to the search index.
+
+    Editions already indexed with the same checksum are skipped, an edition
+    with a different checksum replaces the old one.
+
+    Args:
+        pdf_path: Path to merged PDF named like KANPRABHA_MN_20240120.pdf
+        checksum: Edition checksum from the edition manifest
+        db_path: Path to the search index
+
+    Returns:
+        int: Number of pages indexed (0 if edition was up to date)
+    """
+    name = os.path.splitext(os.path.basename(pdf_path))[0]
+    paper, date_string = name.rsplit("_", 1)
+
+    conn = connect(db_path)
+    try:
+        row = conn.execute("SELECT checksum FROM editions WHERE name = ?", (name,)).fetchone()
+        if row and checksum and row[0] == checksum:
+            print(f"{name} already indexed")
+            return 0
+
+        texts = extract_pages(pdf_path)
+
+        with conn:
+            conn.execute("DELETE FROM pages WHERE name = ?", (name,))
+            conn.execute(
+                "INSERT OR REPLACE INTO editions VALUES (?, ?, ?, ?, ?)",
+                (name, paper, date_string, checksum, len(texts)),
+            )
+            conn.executemany(
+                "INSERT INTO pages (text, name, page) VALUES (?, ?, ?)",
+                [(text, name, page_no) for page_no, text in enumerate(texts, 1) if text],
+            )
+
+        print(f"Indexed {len(texts)} pages of {name}")
+        return len(texts)
+
+    finally:
+        conn.close()
+
+
+def prune_index(days: int, db_path: str = SEARCH_DB) -> int:
+    """Remove editions older than days from the search index.
+
+    Uses the same age rule as cleanup_old_files, so the index never refers
+    to editions that were deleted from output/ and the artifact store.
+
+    Returns:
+        int: Number of editions removed
+    """
+    if not os.path.exists(db_path):
+        return 0
+
+    # An edition is older than days if its date is at or before this day
+    cutoff = get_india_time().replace(tzinfo=None) - dt.timedelta(days=days + 1)
+
+    conn = connect(db_path)
+    try:
+        with conn:
+            names = [
+                row[0]
+                for row in conn.execute(
+                    "SELECT name FROM editions WHERE date <= ?", (cutoff.strftime("%Y%m%d"),)
+                )
+            ]
+            for name in names:
+                print(f"Removing '{name}' older than {days} days from search index")
+                conn.execute("DELETE FROM pages WHERE name = ?", (name,))
+                conn.execute("DELETE FROM editions WHERE name = ?", (name,))
+        return len(names)
+
+    finally:
+        conn.close()
+
+
+def build_query(query: str) -> str:
+    """Turn user input into an FTS5 query matching all words as prefixes.
+
+    Kannada attaches case endings to words, so prefix matching finds
+    'ಬೆಂಗಳೂರಿನಲ್ಲಿ' when searching for 'ಬೆಂಗಳೂರ'.
+    """
+    words = normalize(query).replace('"', " ").split()
+    return " ".join(f'"{word}"*' for word in words)
+
+
+def search(query: str, limit: int = 20, db_path: str = SEARCH_DB) -> List[Dict]:
+    """Search the index, best matches first.
+
+    Returns:
+        list: Hits with paper, date, page and a text snippet
+    """
+    fts_query = build_query(query)
+    if not fts_query or not os.path.exists(db_path):
+        return []
+
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        rows = conn.execute(
+            """
+            SELECT e.paper, e.date, p.page, snippet(pages, 0, char(2), char(3), '…', 16)
+            FROM pages p JOIN editions e ON e.name = p.name
+            WHERE pages MATCH ?
+            ORDER BY rank
+            LIMIT ?
+            """,
+            (fts_query, limit),
+        ).fetchall()
+    finally:
+        conn.close()
+
+    return [
+        {
+            "paper": paper,
+            "date": date_string,
+            "page": page,
+            # Escape page text, then turn match markers into HTML
+            "snippet": html.escape(snippet).replace("\x02", "<b>").replace("\x03", "</b>"),
+        }
+        for paper, date_string, page, snippet in rows
+    ]
@@ -4,7 +4,7 @@
 import datetime as dt
 import os
 import shutil
-from typing import Optional
+from typing import List, Optional
 
 import img2pdf
 from pypdf import PdfWriter
@@ -22,6 +22,21 @@ def get_date_string(date: Optional[dt.datetime] = None, format: str = "%Y%m%d")
     return dt.datetime.strftime(date, format)
 
 
+def list_pages(tmp_dir: str) -> List[str]:
+    """Get paths of page files in tmp_dir in the order merge_pdfs merges them.
+
+    JPG pages take precedence over PDF pages, like in merge_pdfs.
+    """
+    if not os.path.isdir(tmp_dir):
+        return []
+
+    pdf_files = [f for f in os.listdir(tmp_dir) if f.lower().endswith('.pdf')]
+    jpg_files = [f for f in os.listdir(tmp_dir) if f.lower().endswith('.jpg')]
+
+    # Sort to maintain page order
+    return [os.path.join(tmp_dir, f) for f in sorted(jpg_files or pdf_files)]
+
+
 def merge_pdfs(tmp_dir: str, output_path: str) -> bool:
     """Merge all PDFs or images in tmp_dir into a single PDF at output_path.
     
@@ -2,11 +2,13 @@
 # coding: utf-8
 
 import os
-from multiprocessing.dummy import Pool as ThreadPool
 from typing import Dict, List, Optional
 
 import requests
 
+from paperbot.integrity import download_verified
+from paperbot.preflight import check_urls, download_edition
+
 BASE_URL = "https://epaper.vishwavani.news"
 USER_AGENT = (
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
@@ -67,6 +69,40 @@ def fetch_edition_pages(session: requests.Session, date_str: str, sub_edition: i
         return []
 
 
+def get_page_url(page: Dict) -> str:
+    """Build PDF download URL for a page from the edition metadata."""
+    return f"{BASE_URL}/download/{page.get('page_id')}/pdf"
+
+
+def check_pages(session: requests.Session, pages: List[Dict]) -> List[Dict]:
+    """Check availability and size of given pages without downloading them."""
+    headers = {
+        "User-Agent": USER_AGENT,
+        "Referer": BASE_URL + "/",
+        "x-csrftoken": session.cookies.get("csrftoken", ""),
+    }
+    return check_urls([get_page_url(p) for p in pages], session, headers)
+
+
+def preflight_paper(date_string: str, sub_edition: int = 2) -> List[Dict]:
+    """Check availability and size of all pages without downloading them.
+
+    Args:
+        date_string: Date in YYYYMMDD format
+        sub_edition: Sub-edition number (default 2)
+
+    Returns:
+        list: Page check results (see preflight.check_url), in page order
+    """
+    session = requests.Session()
+    if not get_csrf_token(session):
+        print("Failed to initialize session")
+        return []
+
+    pages = fetch_edition_pages(session, date_string, sub_edition)
+    return check_pages(session, pages)
+
+
 def download_page(session: requests.Session, page: Dict) -> Optional[str]:
     """Download a single page PDF."""
     page_id = page.get("page_id")
@@ -84,26 +120,20 @@ def download_page(session: requests.Session, page: Dict) -> Optional[str]:
         "x-csrftoken": csrf,
     }
 
-    download_url = f"{BASE_URL}/download/{page_id}/pdf"
+    download_url = get_page_url(page)
+    
+    filename = f"{page_id}.pdf"
+    filepath = os.path.join("tmp", filename)
     
     try:
-        r = session.get(download_url, headers=headers, stream=True, timeout=30)
-        if r.status_code != 200:
-            print(f"Download failed: {r.status_code}")
+        if not download_verified(download_url, filepath, session, headers=headers, timeout=30):
+            print(f"Download failed: page {page_id}")
             return None
-
-        filename = f"{page_id}.pdf"
-        filepath = os.path.join("tmp", filename)
-        
-        with open(filepath, "wb") as f:
-            for chunk in r.iter_content(1024 * 64):
-                if chunk:
-                    f.write(chunk)
         
         print(f"Downloaded page {page_id}")
         return filepath
 
-    except Exception as e:
+    except (requests.RequestException, OSError) as e:
         print(f"Error downloading page {page_id}: {e}")
         return None
 
@@ -116,7 +146,7 @@ def download_paper(date_string: str, sub_edition: int = 2) -> bool:
         sub_edition: Sub-edition number (default 2)
     
     Returns:
-        bool: True if any pages were downloaded successfully
+        bool: True if every page was downloaded and validated
     """
     session = requests.Session()
     if not get_csrf_token(session):
@@ -124,20 +154,9 @@ def download_paper(date_string: str, sub_edition: int = 2) -> bool:
         return False
 
     pages = fetch_edition_pages(session, date_string, sub_edition)
-    if not pages:
-        return False
-
-    # Download pages in parallel
-    pool = ThreadPool(8)
-    try:
-        results = pool.map(lambda p: download_page(session, p), pages)
-    finally:
-        pool.close()
-        pool.join()
-
-    # Filter out failed downloads
-    downloaded = [r for r in results if r]
-    success = len(downloaded) > 0
-    
-    print(f"Downloaded {len(downloaded)}/{len(pages)} pages")
-    return success
\ No newline at end of file
+    checks = check_pages(session, pages)
+    return download_edition(
+        f"sub-edition {sub_edition} for {date_string}",
+        checks,
+        lambda idx: download_page(session, pages[idx]),
+    )
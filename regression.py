@@ -0,0 +1,346 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import argparse
+import io
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Dict, List, Optional
+
+import img2pdf
+
+import bot
+from paperbot import hosadigantha, kannada_prabha, prajavani, vishwavani
+from paperbot.integrity import read_edition_manifest
+from paperbot.replay import FixtureWriter, has_fixtures, recording, replaying
+from paperbot.utils import get_date_string
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+BASELINES_PATH = os.path.join(FIXTURES_DIR, "baselines.json")
+
+# How much worse than the baseline a replay may be before the check fails
+SIZE_TOLERANCE = 0.05  # relative difference of merged PDF size
+TIME_FACTOR = 1.5
+MEMORY_FACTOR = 1.25
+# Allowances per MB of edition, absorb timer noise and differences between
+# Python versions without hiding regressions of small fixtures
+TIME_SLACK_PER_MB = 0.2  # seconds
+MEMORY_SLACK_PER_MB = 256 * 1024  # bytes
+
+# Date of the synthetic editions, see synthesize()
+SYNTHETIC_DATE = "20240120"
+SYNTHETIC_PAGES = 8
+
+
+def load_baselines() -> Dict[str, Dict]:
+    if not os.path.exists(BASELINES_PATH):
+        return {}
+    with open(BASELINES_PATH) as f:
+        return json.load(f)
+
+
+def save_baselines(baselines: Dict[str, Dict]) -> None:
+    os.makedirs(FIXTURES_DIR, exist_ok=True)
+    with open(BASELINES_PATH, "w") as f:
+        json.dump(baselines, f, indent=2, sort_keys=True)
+
+
+def run_paper(paper: Dict, date_string: str, context) -> Dict:
+    """Run bot.process_paper for a paper in a scratch directory.
+
+    Args:
+        paper: Entry of bot.PAPERS
+        date_string: Date in YYYYMMDD format
+        context: recording() or replaying() context for the paper's fixtures
+
+    Returns:
+        dict: Edition manifest, wall time, peak memory and unmatched requests
+    """
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        try:
+            tracemalloc.start()
+            start = time.perf_counter()
+            with context as handler:
+                output_path = bot.process_paper(
+                    paper["paper_id"],
+                    bot.get_paper_date(paper, date_string),
+                    paper["module"].download_paper,
+                    **paper["kwargs"],
+                )
+            wall_time = time.perf_counter() - start
+            peak_memory = tracemalloc.get_traced_memory()[1]
+            manifest = read_edition_manifest(output_path) if output_path else None
+        finally:
+            tracemalloc.stop()
+            os.chdir(cwd)
+
+    return {
+        "manifest": manifest,
+        "wall_time": round(wall_time, 3),
+        "peak_memory": peak_memory,
+        "unmatched": getattr(handler, "unmatched", []),
+    }
+
+
+def make_baseline(date_string: str, run: Dict) -> Dict:
+    manifest = run["manifest"]
+    return {
+        "date": date_string,
+        "pages": [page["file"] for page in manifest["pages"]],
+        "size": manifest["size"],
+        "checksum": manifest["checksum"],
+        "wall_time": run["wall_time"],
+        "peak_memory": run["peak_memory"],
+    }
+
+
+def compare(baseline: Dict, run: Dict) -> List[str]:
+    """Get list of problems of a replay run compared to its baseline."""
+    manifest = run["manifest"]
+    if run["unmatched"]:
+        return [f"requests not in fixtures: {', '.join(run['unmatched'])}"]
+    if not manifest:
+        return ["no edition produced"]
+
+    problems = []
+    pages = [page["file"] for page in manifest["pages"]]
+    if len(pages) != len(baseline["pages"]):
+        problems.append(f"{len(pages)} pages, expected {len(baseline['pages'])}")
+    elif pages != baseline["pages"]:
+        problems.append(f"pages out of order: {pages}")
+    elif manifest["checksum"] != baseline["checksum"]:
+        problems.append("page contents changed")
+
+    if abs(manifest["size"] - baseline["size"]) > baseline["size"] * SIZE_TOLERANCE:
+        problems.append(f"output size {manifest['size']}, baseline {baseline['size']}")
+
+    size_mb = baseline["size"] / 1000000
+    max_time = baseline["wall_time"] * TIME_FACTOR + TIME_SLACK_PER_MB * size_mb
+    if run["wall_time"] > max_time:
+        problems.append(f"wall time {run['wall_time']}s, baseline {baseline['wall_time']}s")
+
+    max_memory = baseline["peak_memory"] * MEMORY_FACTOR + MEMORY_SLACK_PER_MB * size_mb
+    if run["peak_memory"] > max_memory:
+        problems.append(f"peak memory {run['peak_memory']} B, baseline {baseline['peak_memory']} B")
+
+    return problems
+
+
+def set_baseline(baselines: Dict[str, Dict], paper: Dict, date_string: str) -> bool:
+    """Replay a paper's fixtures and save the run as its baseline."""
+    paper_id = paper["paper_id"]
+    run = run_paper(paper, date_string, replaying(os.path.join(FIXTURES_DIR, paper_id)))
+    if not run["manifest"]:
+        print(f"✗ {paper_id}: Fixtures don't replay: {run['unmatched']}")
+        return False
+
+    baselines[paper_id] = make_baseline(date_string, run)
+    print(f"✓ {paper_id}: {len(baselines[paper_id]['pages'])} pages")
+    return True
+
+
+def record(papers: List[Dict], date_string: str) -> bool:
+    """Record fixtures from the live sites and set baselines from a replay."""
+    baselines = load_baselines()
+    success = True
+
+    for paper in papers:
+        paper_id = paper["paper_id"]
+        fixture_dir = os.path.join(FIXTURES_DIR, paper_id)
+        shutil.rmtree(fixture_dir, ignore_errors=True)
+
+        print(f"\nRecording {paper_id} for date {date_string}")
+        run = run_paper(paper, date_string, recording(fixture_dir))
+        if not run["manifest"]:
+            print(f"✗ {paper_id}: Failed to record")
+            success = False
+            continue
+
+        # Baselines come from a replay, recording time is mostly network time
+        success = set_baseline(baselines, paper, date_string) and success
+
+    save_baselines(baselines)
+    return success
+
+
+def synthetic_jpg(page_no: int) -> bytes:
+    """Noise image of about SYNTHETIC_PAGE_SIZE bytes, the same for each page_no."""
+    from PIL import Image  # installed with img2pdf
+
+    width, height = 360, 480
+    noise = random.Random(page_no).randbytes(width * height)
+    buffer = io.BytesIO()
+    Image.frombytes("L", (width, height), noise).save(buffer, "JPEG", quality=75)
+    return buffer.getvalue()
+
+
+def synthetic_pdf(page_no: int) -> bytes:
+    """Single page PDF of a synthetic_jpg page, like a scanned newspaper page."""
+    return img2pdf.convert(synthetic_jpg(page_no))
+
+
+def synthesize_kannada_prabha(fixtures: FixtureWriter, paper: Dict, date_string: str) -> None:
+    issue_id = paper["kwargs"]["issue_id"]
+    fixtures.add(
+        "GET",
+        "https://www.enewspapr.com/OutSourcingDataChanged.php"
+        f"?operation=getPageArticleDetails&selectedIssueId={issue_id}_{date_string}",
+        json.dumps([{} for _ in range(SYNTHETIC_PAGES)]).encode(),
+    )
+    for page_no in range(1, SYNTHETIC_PAGES + 1):
+        fixtures.add_page(kannada_prabha.get_page_url(issue_id, date_string, page_no), synthetic_pdf(page_no))
+
+
+def synthesize_vishwavani(fixtures: FixtureWriter, paper: Dict, date_string: str) -> None:
+    fixtures.add("GET", vishwavani.BASE_URL, cookies={"csrftoken": "synthetic"})
+
+    pages = [{"page_id": f"{date_string}{page_no:02d}"} for page_no in range(1, SYNTHETIC_PAGES + 1)]
+    date = f"{date_string[:4]}-{date_string[4:6]}-{date_string[6:8]}"
+    fixtures.add(
+        "POST",
+        f"{vishwavani.BASE_URL}/epaper/api/home",
+        json.dumps({"pages": pages}).encode(),
+        data={"date": date, "sub_edition": str(paper["kwargs"]["sub_edition"])},
+    )
+    for page_no, page in enumerate(pages, 1):
+        fixtures.add_page(vishwavani.get_page_url(page), synthetic_pdf(page_no))
+
+
+def synthesize_prajavani(fixtures: FixtureWriter, paper: Dict, date_string: str) -> None:
+    pages = [
+        {"absPageNo": page_no, "id": f"page{page_no}", "sectionName": "STD"}
+        for page_no in range(SYNTHETIC_PAGES, 0, -1)  # out of order, the scraper sorts them
+    ]
+    fixtures.add(
+        "GET",
+        "https://api-epaper-prod.deccanherald.com/epaper/data"
+        f"?date={date_string}&edition={paper['kwargs']['edition']}&publisher=PV",
+        json.dumps({"data": {"sections": [{"pages": pages}]}}).encode(),
+    )
+    for page_no in range(1, SYNTHETIC_PAGES + 1):
+        url = f"https://assets-prod.prajavani.net/PV/{date_string}/data/webepaper/pdf/page{page_no}.pdf"
+        fixtures.add_page(url, synthetic_pdf(page_no))
+
+
+def synthesize_hosadigantha(fixtures: FixtureWriter, paper: Dict, date_string: str) -> None:
+    base_url = "https://epaper.hosadigantha.com"
+    image_urls = [f"{base_url}/page?id={page_no}" for page_no in range(1, SYNTHETIC_PAGES + 1)]
+    thumbs = "".join(f'<a href="#"><img src="{url}&amp;width=100&amp;height=150"></a>' for url in image_urls)
+    fixtures.add(
+        "GET",
+        f"{base_url}/epaper/go/{bot.get_paper_date(paper, date_string)}/{paper['kwargs']['edition']}",
+        f'<html><body><div class="rthumb_bar">{thumbs}</div></body></html>'.encode(),
+        headers={"Content-Type": "text/html; charset=utf-8"},
+    )
+    for page_no, url in enumerate(image_urls, 1):
+        fixtures.add_page(url, synthetic_jpg(page_no))
+
+
+# Scraper module -> function writing the responses its site would send
+SYNTHESIZERS = {
+    kannada_prabha: synthesize_kannada_prabha,
+    vishwavani: synthesize_vishwavani,
+    prajavani: synthesize_prajavani,
+    hosadigantha: synthesize_hosadigantha,
+}
+
+
+def synthesize(papers: List[Dict]) -> bool:
+    """Generate small synthetic editions as fixtures and set baselines from a replay.
+
+    Keeps the check meaningful without access to the live sites.
+    """
+    baselines = load_baselines()
+    success = True
+
+    for paper in papers:
+        paper_id = paper["paper_id"]
+        fixtures = FixtureWriter(os.path.join(FIXTURES_DIR, paper_id))
+        SYNTHESIZERS[paper["module"]](fixtures, paper, SYNTHETIC_DATE)
+        fixtures.save()
+
+        print(f"\nSynthesized {paper_id} for date {SYNTHETIC_DATE}")
+        success = set_baseline(baselines, paper, SYNTHETIC_DATE) and success
+
+    save_baselines(baselines)
+    return success
+
+
+def check(papers: List[Dict], update_baselines: bool = False, allow_missing: bool = False) -> bool:
+    """Replay fixtures of all papers and compare against baselines.
+
+    Papers without fixtures or baseline fail the check unless allow_missing.
+    """
+    baselines = load_baselines()
+    results = {}
+
+    for paper in papers:
+        paper_id = paper["paper_id"]
+        fixture_dir = os.path.join(FIXTURES_DIR, paper_id)
+        if paper_id not in baselines or not has_fixtures(fixture_dir):
+            print(f"\nNo fixtures for {paper_id}, record them with: python regression.py record")
+            if not allow_missing:
+                results[paper_id] = ["no fixtures or baseline"]
+            continue
+
+        baseline = baselines[paper_id]
+        run = run_paper(paper, baseline["date"], replaying(fixture_dir))
+        results[paper_id] = compare(baseline, run)
+
+        if update_baselines and not results[paper_id]:
+            baselines[paper_id] = make_baseline(baseline["date"], run)
+        print(f"{paper_id}: {run['wall_time']}s, peak memory {run['peak_memory']} B")
+
+    print("\nRegression check complete:")
+    for paper_id, problems in results.items():
+        if problems:
+            print(f"✗ {paper_id}: {'; '.join(problems)}")
+        else:
+            print(f"✓ {paper_id}")
+
+    if update_baselines:
+        save_baselines(baselines)
+
+    return not any(results.values())
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Replay recorded responses through bot.process_paper and compare to baselines"
+    )
+    parser.add_argument("command", choices=["record", "synthesize", "check"])
+    parser.add_argument("--paper", action="append", help="only this paper_id (repeatable)")
+    parser.add_argument("--date", help="date to record in YYYYMMDD format (default today)")
+    parser.add_argument(
+        "--update-baselines",
+        action="store_true",
+        help="save wall time and memory of passing papers as new baselines",
+    )
+    parser.add_argument(
+        "--allow-missing",
+        action="store_true",
+        help="don't fail the check for papers without fixtures or baseline",
+    )
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    papers = [p for p in bot.PAPERS if not args.paper or p["paper_id"] in args.paper]
+
+    if args.command == "record":
+        ok = record(papers, args.date or get_date_string())
+    elif args.command == "synthesize":
+        ok = synthesize(papers)
+    else:
+        ok = check(papers, args.update_baselines, args.allow_missing)
+
+    sys.exit(0 if ok else 1)
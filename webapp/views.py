@@ -1,9 +1,34 @@
 import datetime as dt
+import os
+
 import requests
-from flask import Blueprint, redirect, render_template
+from flask import Blueprint, jsonify, redirect, render_template, request, send_from_directory
+
+from paperbot.search import SEARCH_DB, search as search_index
 
 views = Blueprint("views", __name__)
 
+# Search index, set SEARCH_DB when it is deployed from the artifact store
+SEARCH_DB_PATH = os.environ.get("SEARCH_DB", SEARCH_DB)
+
+# Listing and feed written by the bot at the end of each run
+LISTING_DIR = os.path.join(os.path.dirname(__file__), "static", "listing")
+
+
+def send_listing(filename: str, mimetype: str):
+    """Serve a listing file, gzipped as written by the bot if client accepts it."""
+    gz_filename = filename + ".gz"
+    # "gzip;q=0" means the client refuses gzip
+    if request.accept_encodings["gzip"] > 0 and os.path.exists(os.path.join(LISTING_DIR, gz_filename)):
+        response = send_from_directory(LISTING_DIR, gz_filename, mimetype=mimetype)
+        response.headers["Content-Encoding"] = "gzip"
+    else:
+        response = send_from_directory(LISTING_DIR, filename, mimetype=mimetype)
+
+    response.headers["Vary"] = "Accept-Encoding"
+    response.headers["Cache-Control"] = "public, max-age=3600"
+    return response
+
 
 def get_papers_list():
     URL = "https://api.github.com/repos/sankethsj/newspaper-bot/contents/output"
@@ -18,6 +43,9 @@ def get_papers_list():
 
 @views.route("/", methods=["GET"])
 def home():
+    if os.path.exists(os.path.join(LISTING_DIR, "index.html")):
+        return send_listing("index.html", "text/html")
+
     # papers = get_papers_list()
 
     # if papers:
@@ -34,6 +62,16 @@ def home():
     return render_template("home.html", papers=[])
 
 
+@views.route("/papers.json", methods=["GET"])
+def papers_json():
+    return send_listing("papers.json", "application/json")
+
+
+@views.route("/feed.atom", methods=["GET"])
+def feed():
+    return send_listing("feed.atom", "application/atom+xml")
+
+
 @views.route("/download/<string:sha>", methods=["GET"])
 def download_paper(sha: str):
     papers = get_papers_list()
@@ -43,3 +81,11 @@ def download_paper(sha: str):
             return redirect(paper["download_url"])
 
     return render_template("download_error.html")
+
+
+@views.route("/search", methods=["GET"])
+def search():
+    query = request.args.get("q", "")
+    limit = max(1, min(request.args.get("limit", 20, type=int), 100))
+
+    return jsonify({"query": query, "hits": search_index(query, limit=limit, db_path=SEARCH_DB_PATH)})